@@ -290,6 +290,15 @@ def shuffle_dataset(buffer_size, shuffle_shards=True, dataset_size=None):
 
   Returns:
     A ``tf.data.Dataset`` transformation.
+
+  Tip:
+    The shuffle buffer keeps :obj:`buffer_size` raw examples in memory, which
+    is the main memory cost of the input pipeline. Because the dataset is
+    first sharded in a random order, a buffer smaller than the dataset still
+    produces a good global shuffle and can be used to reduce the memory usage.
+    However, very small buffers increase the number of shards and each shard
+    has to skip over the preceding examples, so re-reading the data files can
+    become the bottleneck for large corpora.
   """
 
   def _shuffle(dataset):
@@ -382,6 +391,12 @@ def batch_sequence_dataset(batch_size,
     ValueError: if the number of length functions in :obj:`length_fn` does not
       match the number of parallel elements.
 
+  Tip:
+    With :obj:`batch_type` "tokens" and :obj:`length_bucket_width` 1, batches
+    are dynamically packed by a token budget: each batch contains as many
+    same-length sequences as fit in :obj:`batch_size` tokens, minimizing the
+    padding waste.
+
   See Also:
     :func:`opennmt.data.batch_dataset`
   """
@@ -423,7 +438,9 @@ def batch_sequence_dataset(batch_size,
     size = batch_size // (key * length_bucket_width)
     required_multiple = batch_multiplier * batch_size_multiple
     if required_multiple > 1:
-      size = size + required_multiple - size % required_multiple
+      # Round down to the required multiple so that the batch does not exceed
+      # the target number of tokens.
+      size -= size % required_multiple
     return tf.cast(tf.maximum(size, required_multiple), tf.int64)
 
   if length_bucket_width is None:
@@ -461,7 +478,8 @@ def training_pipeline(batch_size,
                       dataset_size=None,
                       shuffle_buffer_size=None,
                       prefetch_buffer_size=None,
-                      cardinality_multiple=1):
+                      cardinality_multiple=1,
+                      cache_path=None):
   """Transformation that applies most of the dataset operations commonly used
   for training on sequence data:
 
@@ -499,7 +517,8 @@ def training_pipeline(batch_size,
     num_shards: The number of data shards (usually the number of workers in a
       distributed setting).
     shard_index: The shard index this data pipeline should read from.
-    num_threads: The number of elements processed in parallel.
+    num_threads: The number of elements processed in parallel. If ``None``,
+      use an automatically tuned value.
     dataset_size: If the dataset size is already known, it can be passed here to
       avoid a slower generic computation of the dataset size later.
     shuffle_buffer_size: The number of elements from which to sample.
@@ -507,6 +526,12 @@ def training_pipeline(batch_size,
       ``None``, use an automatically tuned value.
     cardinality_multiple: Ensure that the dataset cardinality is a multiple of
       this value when :obj:`single_pass` is ``True``.
+    cache_path: If not ``None``, cache the raw examples so that subsequent
+      epochs do not read the data files again (an empty string caches in
+      memory, otherwise examples are cached in this file). The cache is
+      disabled when :obj:`single_pass` is ``True``, for weighted datasets, or
+      when :obj:`shuffle_buffer_size` is smaller than the dataset size (set it
+      to -1 to shuffle the full dataset and enable caching).
 
   Returns:
     A ``tf.data.Dataset`` transformation.
@@ -547,8 +572,33 @@ def training_pipeline(batch_size,
   def _make_single_dataset(dataset):
     if num_shards > 1:
       dataset = dataset.shard(num_shards, shard_index)
-    if shuffle_buffer_size is not None and shuffle_buffer_size != 0:
-      dataset = dataset.apply(shuffle_dataset(shuffle_buffer_size, dataset_size=dataset_size))
+    size = dataset_size
+    shuffle = shuffle_buffer_size is not None and shuffle_buffer_size != 0
+    if cache_path is not None and not single_pass:
+      cache_dataset = True
+      if shuffle and shuffle_buffer_size > 0:
+        if size is None:
+          size = int(get_dataset_size(dataset))
+        if shuffle_buffer_size < size:
+          # When the shuffle buffer is smaller than the dataset, the dataset is
+          # sharded in a random order with skip() and take(). These partial
+          # iterations are incompatible with caching: the cache is discarded
+          # before it is fully written, or the cache file stays locked by the
+          # previous shard iterator.
+          tf.get_logger().warning(
+              "The training examples are not cached because the shuffle "
+              "buffer is smaller than the dataset (%d < %d). Set "
+              "sample_buffer_size to -1 to enable caching.",
+              shuffle_buffer_size, size)
+          cache_dataset = False
+      if cache_dataset:
+        path = cache_path
+        if path and num_shards > 1:
+          # Give each input pipeline its own cache file.
+          path = "%s-%d" % (path, shard_index)
+        dataset = dataset.cache(path)
+    if shuffle:
+      dataset = dataset.apply(shuffle_dataset(shuffle_buffer_size, dataset_size=size))
     return dataset
 
   def _pipeline(dataset):
@@ -562,7 +612,8 @@ def training_pipeline(batch_size,
     else:
       dataset = _make_single_dataset(dataset)
     if process_fn is not None:
-      dataset = dataset.map(process_fn, num_parallel_calls=num_threads or 4)
+      dataset = dataset.map(
+          process_fn, num_parallel_calls=num_threads or tf.data.experimental.AUTOTUNE)
     if transform_fns is not None:
       for transform_fn in transform_fns:
         dataset = dataset.apply(transform_fn)
@@ -585,6 +636,13 @@ def training_pipeline(batch_size,
     else:
       dataset = dataset.apply(make_cardinality_multiple_of(cardinality_multiple))
     dataset = dataset.prefetch(prefetch_buffer_size)
+    # Training examples are shuffled so the pipeline does not need to produce
+    # elements in a deterministic order, which allows additional parallelism.
+    options = tf.data.Options()
+    options.experimental_deterministic = False
+    options.experimental_optimization.map_parallelization = True
+    options.experimental_optimization.parallel_batch = True
+    dataset = dataset.with_options(options)
     return dataset
 
   return _pipeline
@@ -615,7 +673,8 @@ def inference_pipeline(batch_size,
       responsible to restore the predictions in order. An "index" key will be
       inserted in the examples dictionary.
     length_fn: A function mapping features to a sequence length.
-    num_threads: The number of elements processed in parallel.
+    num_threads: The number of elements processed in parallel. If ``None``,
+      use an automatically tuned value.
     prefetch_buffer_size: The number of batches to prefetch asynchronously. If
       ``None``, use an automatically tuned value.
 
@@ -638,7 +697,8 @@ def inference_pipeline(batch_size,
 
   def _pipeline(dataset):
     if process_fn is not None:
-      dataset = dataset.map(process_fn, num_parallel_calls=num_threads)
+      dataset = dataset.map(
+          process_fn, num_parallel_calls=num_threads or tf.data.experimental.AUTOTUNE)
     if transform_fns is not None:
       for transform_fn in transform_fns:
         dataset = dataset.apply(transform_fn)
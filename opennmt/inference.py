@@ -8,11 +8,49 @@ import tensorflow as tf
 from opennmt.utils import misc
 
 
+def _get_dataset_function(model, method_name, input_signature, jit_compile=False):
+  """Returns a ``tf.function`` running a model method on dataset elements.
+
+  The built functions are cached on the model instance so that multiple calls
+  with the same input signature reuse the same trace, and the traces are
+  released with the model.
+
+  Args:
+    model: A :class:`opennmt.models.Model` instance.
+    method_name: The name of the model method to wrap.
+    input_signature: The input signature of the function, matching the element
+      specification of the dataset it will consume.
+    jit_compile: Compile the function with XLA.
+
+  Returns:
+    A traced ``tf.function``, possibly reused from a previous call.
+  """
+  functions = model.__dict__.get("_dataset_functions_cache")
+  if functions is None:
+    functions = {}
+    # Bypass the Keras attribute tracking as this cache maps non-string keys
+    # to tf.function objects that should not be included in checkpoints.
+    object.__setattr__(model, "_dataset_functions_cache", functions)
+  key = (method_name, tuple(tf.nest.flatten(input_signature)), jit_compile)
+  function = functions.get(key)
+  if function is None:
+    function = tf.function(
+        getattr(model, method_name),
+        input_signature=input_signature,
+        experimental_compile=True if jit_compile else None)
+    if not tf.config.functions_run_eagerly():
+      tf.get_logger().info("Tracing and optimizing the %s graph...", method_name)
+      function.get_concrete_function()  # Trace the function now.
+    functions[key] = function
+  return function
+
+
 def predict_dataset(model,
                     dataset,
                     print_params=None,
                     predictions_file=None,
-                    log_time=False):
+                    log_time=False,
+                    jit_compile=False):
   """Outputs the model predictions for the dataset.
 
   To run inference on strings directly, see
@@ -27,16 +65,16 @@ def predict_dataset(model,
       are printed on the standard output.
     log_time: If ``True``, several time metrics will be printed in the logs at
       the end of the inference loop.
+    jit_compile: Compile the inference function with XLA for increased operation
+      fusion. Not all models and operations are compatible.
   """
   if predictions_file:
     stream = open(predictions_file, encoding="utf-8", mode="w")
   else:
     stream = sys.stdout
 
-  infer_fn = tf.function(model.infer, input_signature=(dataset.element_spec,))
-  if not tf.config.functions_run_eagerly():
-    tf.get_logger().info("Tracing and optimizing the inference graph...")
-    infer_fn.get_concrete_function()  # Trace the function now.
+  infer_fn = _get_dataset_function(
+      model, "infer", (dataset.element_spec,), jit_compile=jit_compile)
 
   # Inference might return out-of-order predictions. The OrderRestorer utility is
   # used to write predictions in their original order.
@@ -56,8 +94,8 @@ def predict_dataset(model,
   max_time_without_output = 10
   last_output_time = start_time
 
-  for features in dataset:
-    predictions = infer_fn(features)
+  def _consume_predictions(predictions):
+    nonlocal total_examples, total_tokens, last_output_time
     predictions = tf.nest.map_structure(lambda t: t.numpy(), predictions)
     batch_time = time.time()
 
@@ -74,6 +112,7 @@ def predict_dataset(model,
               ordered_writer.buffer_size,
               ordered_writer.next_index + 1)
           last_output_time = batch_time
+    stream.flush()
 
     if log_time:
       batch_size = next(iter(predictions.values())).shape[0]
@@ -82,7 +121,20 @@ def predict_dataset(model,
       if length is not None:
         if len(length.shape) == 2:
           length = length[:, 0]
-        total_tokens += sum(length)
+        total_tokens += length.sum()
+
+  # Keep one batch of predictions in flight: calling .numpy() synchronizes on
+  # the computation, so the previous batch is consumed on the host only after
+  # the next one has been submitted to the device. This overlaps the device to
+  # host transfer and the output writing with the model computation.
+  pending_predictions = None
+  for features in dataset:
+    predictions = infer_fn(features)
+    if pending_predictions is not None:
+      _consume_predictions(pending_predictions)
+    pending_predictions = predictions
+  if pending_predictions is not None:
+    _consume_predictions(pending_predictions)
 
   if log_time:
     end_time = time.time()
@@ -98,7 +150,8 @@ def predict_dataset(model,
 def score_dataset(model,
                   dataset,
                   print_params=None,
-                  output_file=None):
+                  output_file=None,
+                  jit_compile=False):
   """Outputs the model scores for the dataset.
 
   Args:
@@ -109,18 +162,23 @@ def score_dataset(model,
       :meth:`opennmt.models.Model.print_score`.
     output_file: If set, outputs are saved in this file, otherwise they are
       printed on the standard output.
+    jit_compile: Compile the scoring function with XLA for increased operation
+      fusion. Not all models and operations are compatible.
   """
   if output_file:
     stream = open(output_file, encoding="utf-8", mode="w")
   else:
     stream = sys.stdout
 
-  score_fn = tf.function(model.score, input_signature=dataset.element_spec)
+  score_fn = _get_dataset_function(
+      model, "score", dataset.element_spec, jit_compile=jit_compile)
+
   for features, labels in dataset:
     results = score_fn(features, labels)
     results = tf.nest.map_structure(lambda t: t.numpy(), results)
     for batch in misc.extract_batches(results):
       model.print_score(batch, params=print_params, stream=stream)
+    stream.flush()
 
   if output_file:
     stream.close()
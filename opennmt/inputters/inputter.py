@@ -83,7 +83,7 @@ class Inputter(tf.keras.layers.Layer):
                              batch_size,
                              batch_type="examples",
                              length_bucket_width=None,
-                             num_threads=1,
+                             num_threads=None,
                              prefetch_buffer_size=None):
     """Builds a dataset to be used for inference.
 
@@ -97,7 +97,8 @@ class Inputter(tf.keras.layers.Layer):
       length_bucket_width: The width of the length buckets to select batch
         candidates from (for efficiency). Set ``None`` to not constrain batch
         formation.
-      num_threads: The number of elements processed in parallel.
+      num_threads: The number of elements processed in parallel. If ``None``,
+        use an automatically tuned value.
       prefetch_buffer_size: The number of batches to prefetch asynchronously. If
         ``None``, use an automatically tuned value.
 
@@ -115,7 +116,7 @@ class Inputter(tf.keras.layers.Layer):
         return features[0]
       return features
 
-    transform_fns = [lambda dataset: dataset.map(_map_fn, num_parallel_calls=num_threads or 1)]
+    transform_fns = [lambda dataset: dataset.map(_map_fn, num_parallel_calls=num_threads or tf.data.experimental.AUTOTUNE)]
 
     dataset = self.make_dataset(features_file, training=False)
     dataset = dataset.apply(dataset_util.inference_pipeline(
@@ -529,7 +530,7 @@ class ExampleInputterAdapter:
                               batch_size,
                               batch_type="examples",
                               length_bucket_width=None,
-                              num_threads=1,
+                              num_threads=None,
                               prefetch_buffer_size=None):
     """Builds a dataset to be used for evaluation.
 
@@ -541,7 +542,8 @@ class ExampleInputterAdapter:
       length_bucket_width: The width of the length buckets to select batch
         candidates from (for efficiency). Set ``None`` to not constrain batch
         formation.
-      num_threads: The number of elements processed in parallel.
+      num_threads: The number of elements processed in parallel. If ``None``,
+        use an automatically tuned value.
       prefetch_buffer_size: The number of batches to prefetch asynchronously. If
         ``None``, use an automatically tuned value.
 
@@ -559,7 +561,7 @@ class ExampleInputterAdapter:
       length_fn = self.get_length
 
     map_fn = lambda *arg: self.make_features(element=misc.item_or_tuple(arg), training=False)
-    transform_fns = [lambda dataset: dataset.map(map_fn, num_parallel_calls=num_threads or 1)]
+    transform_fns = [lambda dataset: dataset.map(map_fn, num_parallel_calls=num_threads or tf.data.experimental.AUTOTUNE)]
 
     dataset = self.make_dataset(data_files, training=False)
     dataset = dataset.apply(dataset_util.inference_pipeline(
@@ -586,10 +588,11 @@ class ExampleInputterAdapter:
                             single_pass=False,
                             num_shards=1,
                             shard_index=0,
-                            num_threads=4,
+                            num_threads=None,
                             prefetch_buffer_size=None,
                             cardinality_multiple=1,
-                            weights=None):
+                            weights=None,
+                            cache_path=None):
     """Builds a dataset to be used for training. It supports the full training
     pipeline, including:
 
@@ -621,13 +624,18 @@ class ExampleInputterAdapter:
       num_shards: The number of data shards (usually the number of workers in a
         distributed setting).
       shard_index: The shard index this data pipeline should read from.
-      num_threads: The number of elements processed in parallel.
+      num_threads: The number of elements processed in parallel. If ``None``,
+        use an automatically tuned value.
       prefetch_buffer_size: The number of batches to prefetch asynchronously. If
         ``None``, use an automatically tuned value.
       cardinality_multiple: Ensure that the dataset cardinality is a multiple of
         this value when :obj:`single_pass` is ``True``.
       weights: An optional list of weights to create a weighted dataset out of
         multiple training files.
+      cache_path: If not ``None``, cache the raw examples so that subsequent
+        epochs do not read the data files again (an empty string caches in
+        memory, otherwise examples are cached in this file). The cache requires
+        a :obj:`shuffle_buffer_size` that covers the full dataset, e.g. -1.
 
     Returns:
       A ``tf.data.Dataset``.
@@ -650,7 +658,7 @@ class ExampleInputterAdapter:
     filter_fn = lambda *arg: (
         self.keep_for_training(misc.item_or_tuple(arg), maximum_length=maximum_length))
     transform_fns = [
-        lambda dataset: dataset.map(map_fn, num_parallel_calls=num_threads or 4),
+        lambda dataset: dataset.map(map_fn, num_parallel_calls=num_threads or tf.data.experimental.AUTOTUNE),
         lambda dataset: dataset.filter(filter_fn)]
 
     dataset = self.make_dataset(data_files, training=True)
@@ -672,7 +680,8 @@ class ExampleInputterAdapter:
         dataset_size=self.get_dataset_size(data_files),
         shuffle_buffer_size=shuffle_buffer_size,
         prefetch_buffer_size=prefetch_buffer_size,
-        cardinality_multiple=cardinality_multiple)(dataset)
+        cardinality_multiple=cardinality_multiple,
+        cache_path=cache_path)(dataset)
     return dataset
 
 
@@ -701,7 +710,7 @@ class ExampleInputter(ParallelInputter, ExampleInputterAdapter):
                              batch_size,
                              batch_type="examples",
                              length_bucket_width=None,
-                             num_threads=1,
+                             num_threads=None,
                              prefetch_buffer_size=None):
     return self.features_inputter.make_inference_dataset(
         features_file,
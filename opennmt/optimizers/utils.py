@@ -121,4 +121,8 @@ class GradientAccumulator(object):
       return
     self._accum_steps.assign(0)
     for gradient in self._gradients:
-      gradient.assign(tf.zeros(gradient.shape, dtype=gradient.dtype), read_value=False)
+      # Assign zeros instead of subtracting the variable from itself: the
+      # latter produces NaN when the accumulator holds non finite values,
+      # which routinely happens when the loss scale is probed under mixed
+      # precision.
+      gradient.assign(tf.zeros_like(gradient), read_value=False)
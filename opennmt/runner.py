@@ -1,18 +1,15 @@
 """Main library entrypoint."""
 
 import copy
+import logging
 import os
-import sys
 import random
-import math
-import subprocess
-import time
-import tempfile
-import yaml
 
 import numpy as np
 import tensorflow as tf
+import yaml
 
+from opennmt import config as config_util
 from opennmt import evaluation
 from opennmt import inference
 from opennmt import models
@@ -22,29 +19,32 @@ from opennmt.utils import misc
 from opennmt.version import __version__
 
 
-# These options require a value but we can fallback to a default one.
-_CONFIG_FALLBACK = {
-    "params": {},
-    "train": {
-        "batch_type": "examples",
-        "length_bucket_width": 1,
-        "sample_buffer_size": 500000,
-        "save_summary_steps": 100
-    },
-    "eval": {
-        "length_bucket_width": None,
-        "batch_type": "examples",
-        "batch_size": 32
-    },
-    "infer": {
-        "length_bucket_width": None,
-        "batch_type": "examples",
-        "batch_size": 16
-    },
-    "score": {
-        "batch_size": 64
-    }
-}
+def _default_config():
+  """Returns a new configuration with default values for the options that
+  require one.
+  """
+  return {
+      "params": {},
+      "train": {
+          "batch_type": "examples",
+          "length_bucket_width": 1,
+          "sample_buffer_size": 500000,
+          "save_summary_steps": 100
+      },
+      "eval": {
+          "length_bucket_width": None,
+          "batch_type": "examples",
+          "batch_size": 32
+      },
+      "infer": {
+          "length_bucket_width": None,
+          "batch_type": "examples",
+          "batch_size": 16
+      },
+      "score": {
+          "batch_size": 64
+      }
+  }
 
 class Runner(object):
   """Class for running and exporting models."""
@@ -63,7 +63,8 @@ class Runner(object):
       config: The run configuration.
       auto_config: If ``True``, use automatic configuration values defined by
         :obj:`model`.
-      mixed_precision: Enable mixed precision.
+      mixed_precision: Enable mixed precision. This can also be enabled with the
+        ``mixed_precision`` parameter in the run configuration.
       seed: The random seed to set.
 
     Raises:
@@ -83,8 +84,13 @@ class Runner(object):
     self._optimizer = None
     self._config = copy.deepcopy(config)
     self._auto_config = auto_config
+    self._initialized_model = None
+    self._initialized_model_config = None
+    if not mixed_precision:
+      mixed_precision = self._config.get("params", {}).get("mixed_precision", False)
     self._mixed_precision = mixed_precision
     if mixed_precision:
+      tf.get_logger().info("Enabling mixed precision")
       tf.config.optimizer.set_experimental_options({"auto_mixed_precision": True})
     if seed is not None:
       np.random.seed(seed)
@@ -103,7 +109,7 @@ class Runner(object):
 
   def _finalize_config(self, training=False, num_replicas=1, num_devices=1):
     # Configuration priority: user config > auto config > default config.
-    config = copy.deepcopy(_CONFIG_FALLBACK)
+    config = _default_config()
     if self._auto_config:
       model_config = self._model.auto_config(num_replicas=num_replicas)
       if not model_config:
@@ -131,13 +137,25 @@ class Runner(object):
             num_devices=num_devices,
             mixed_precision=self._mixed_precision)
 
-    tf.get_logger().info(
-        "Using parameters:\n%s", yaml.dump(config, indent=2, default_flow_style=False))
+    logger = tf.get_logger()
+    if logger.isEnabledFor(logging.INFO):
+      logger.info(
+          "Using parameters:\n%s", yaml.dump(config, indent=2, default_flow_style=False))
     return config
 
-  def _init_model(self, config):
+  def _init_model(self, config, reuse=True):
+    model_config = (config["data"], config["params"])
+    if (reuse
+        and self._initialized_model is not None
+        and self._initialized_model_config == model_config):
+      # Return the same model instance so that repeated operations reuse its
+      # traced functions instead of rebuilding and retracing the graphs.
+      return self._initialized_model
     model = self._model_fn()
     model.initialize(config["data"], params=config["params"])
+    if reuse:
+      self._initialized_model = model
+      self._initialized_model_config = copy.deepcopy(model_config)
     return model
 
   def train(self,
@@ -170,7 +188,9 @@ class Runner(object):
         training=True,
         num_replicas=num_replicas,
         num_devices=num_devices)
-    model = self._init_model(config)
+    # The training requires a fresh model instance as the variables may need to
+    # be created under a distribution strategy scope.
+    model = self._init_model(config, reuse=False)
     optimizer = model.get_optimizer()
 
     data_config = config["data"]
@@ -198,7 +218,8 @@ class Runner(object):
         shard_index=input_context.input_pipeline_id,
         prefetch_buffer_size=train_config.get("prefetch_buffer_size"),
         cardinality_multiple=input_context.num_replicas_in_sync,
-        weights=data_config.get("train_files_weights"))
+        weights=data_config.get("train_files_weights"),
+        cache_path=train_config.get("cache_path"))
 
     checkpoint = None
     evaluator = None
@@ -337,7 +358,7 @@ class Runner(object):
     if tgt_vocab is not None:
       self._config["data"]["target_vocabulary"] = tgt_vocab
     new_config = self._finalize_config()
-    new_model = self._init_model(new_config)
+    new_model = self._init_model(new_config, reuse=False)
     new_optimizer = new_model.get_optimizer()
     new_checkpoint = checkpoint_util.Checkpoint.from_config(
         new_config, new_model, optimizer=new_optimizer)
@@ -380,7 +401,8 @@ class Runner(object):
         dataset,
         print_params=infer_config,
         predictions_file=predictions_file,
-        log_time=log_time)
+        log_time=log_time,
+        jit_compile=infer_config.get("jit_compile", False))
 
   def export(self, export_dir, checkpoint_path=None, exporter=None):
     """Exports a model.
@@ -418,14 +440,19 @@ class Runner(object):
         predictions_file,
         score_config["batch_size"],
         prefetch_buffer_size=score_config.get("prefetch_buffer_size"))
-    inference.score_dataset(model, dataset, print_params=score_config, output_file=output_file)
+    inference.score_dataset(
+        model,
+        dataset,
+        print_params=score_config,
+        output_file=output_file,
+        jit_compile=score_config.get("jit_compile", False))
 
 
 def _count_batch_accum(batch_size, target_batch_size, num_replicas=1):
   """Given the current batch size, the number of replicas, and the requested
   effective batch size, returns the number of gradients to accumulate.
   """
-  return int(math.ceil(float(target_batch_size) / (batch_size * num_replicas)))
+  return -(-target_batch_size // (batch_size * num_replicas))
 
 def _auto_tune_batch_size(config,
                           min_batch_size=1024,
@@ -440,11 +467,15 @@ def _auto_tune_batch_size(config,
 
   This function runs some training iterations and uses out-of-memory errors as
   search conditions. A binary search is used to converge to a suitable batch
-  size.
+  size. The tuned value is saved in the model directory and reused by future
+  trainings with a compatible configuration, so the search usually runs once
+  per model.
 
   We prefer to run the iterations in a different process so that it does not
   alter the current context (OOM may not be safe to recover from, see for
-  example https://stackoverflow.com/q/53820713/2529808).
+  example https://stackoverflow.com/q/53820713/2529808). The process is
+  spawned with ``multiprocessing`` instead of running the command line
+  entrypoint, which avoids serializing the configuration to disk.
 
   Args:
     config: The training configuration.
@@ -460,57 +491,118 @@ def _auto_tune_batch_size(config,
   Returns:
     The autotuned batch size.
   """
+  # Only the autotuner needs these modules so they are imported lazily to not
+  # slow down the module load, in particular in the spawned trial processes.
+  import multiprocessing  # pylint: disable=import-outside-toplevel
+  import tempfile  # pylint: disable=import-outside-toplevel
+
   model_dir = config["model_dir"]
+
+  # Reuse a previously tuned batch size if the run settings that constrain the
+  # memory usage did not change.
+  record_path = os.path.join(model_dir, "autotuned_batch_size.yml")
+  record = {
+      "batch_type": config["train"]["batch_type"],
+      "max_batch_size": max_batch_size,
+      "maximum_features_length": config["train"].get("maximum_features_length"),
+      "maximum_labels_length": config["train"].get("maximum_labels_length"),
+      "mixed_precision": mixed_precision,
+      "num_devices": num_devices,
+  }
+  batch_size = _load_tuned_batch_size(record_path, record)
+  if batch_size is not None:
+    tf.get_logger().info(
+        "Reusing batch size %d previously tuned for this model. Delete %s "
+        "to run a new search.", batch_size, record_path)
+    return batch_size
+
   with tempfile.TemporaryDirectory() as tmpdir:
     config = copy.deepcopy(config)
     config["model_dir"] = tmpdir
     config["train"]["save_checkpoints_steps"] = None
     config["train"]["average_last_checkpoints"] = 0
     config["train"]["max_step"] = sample_iterations
-    config_path = os.path.join(config["model_dir"], "batch_size_autotuner.yml")
     model_description = os.path.join(model_dir, "model_description.py")
 
-    args = [
-        sys.executable or "python",
-        "-m", "opennmt.bin.main",
-        "--config", config_path,
-        "--model", model_description,
-        "--checkpoint_path", model_dir,
-    ]
-    if mixed_precision:
-      args.extend(["--mixed_precision"])
-    args.extend([
-        "train",
-        "--num_gpus", str(num_devices),
-    ])
+    # Spawn a fresh process for each trial. A forked process would inherit the
+    # current CUDA context, which is not safe to share.
+    process_context = multiprocessing.get_context("spawn")
 
     tf.get_logger().info(
         "Searching the largest batch size between %d and %d with a precision of %d...",
         min_batch_size, max_batch_size, min_range)
 
-    while max_batch_size - min_batch_size > min_range:
-      batch_size = (max_batch_size + min_batch_size) // 2
-
-      # Update configuration with current batch size and adjusted gradients
-      # accumulation.
-      config["train"]["batch_size"] = batch_size
-      with tf.io.gfile.GFile(config_path, mode="wb") as config_file:
-        yaml.dump(config, config_file)
-
-      tf.get_logger().info("Trying training with batch size %d...", batch_size)
-      time.sleep(1)
-      with open(os.devnull, "w") as devnull:
-        process = subprocess.Popen(args, stdout=devnull, stderr=devnull)
-        exit_code = process.wait()
-
-      if exit_code != 0:
-        tf.get_logger().info("... failed.")
-        max_batch_size = batch_size - 1
+    # Reduce the TensorFlow logging noise of the trial processes.
+    tf_cpp_min_log_level = os.environ.get("TF_CPP_MIN_LOG_LEVEL")
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+    try:
+      while max_batch_size - min_batch_size > min_range:
+        batch_size = (max_batch_size + min_batch_size) // 2
+
+        # Update configuration with current batch size and adjusted gradients
+        # accumulation.
+        config["train"]["batch_size"] = batch_size
+
+        tf.get_logger().info("Trying training with batch size %d...", batch_size)
+        process = process_context.Process(
+            target=_run_batch_size_trial,
+            args=(config, model_description, model_dir, num_devices, mixed_precision))
+        process.start()
+        process.join()
+
+        if process.exitcode != 0:
+          tf.get_logger().info("... failed.")
+          max_batch_size = batch_size - 1
+        else:
+          tf.get_logger().info(
+              "... succeeded, continue until the search range is smaller than %d.", min_range)
+          min_batch_size = batch_size
+    finally:
+      if tf_cpp_min_log_level is None:
+        os.environ.pop("TF_CPP_MIN_LOG_LEVEL", None)
       else:
-        tf.get_logger().info(
-            "... succeeded, continue until the search range is smaller than %d.", min_range)
-        min_batch_size = batch_size
+        os.environ["TF_CPP_MIN_LOG_LEVEL"] = tf_cpp_min_log_level
 
   batch_size = int(scaling_factor * min_batch_size)
   tf.get_logger().info("Batch size auto tuned to %d.", batch_size)
+
+  _save_tuned_batch_size(record_path, record, batch_size)
   return batch_size
+
+def _load_tuned_batch_size(record_path, record):
+  """Returns the batch size tuned by a previous search, or ``None`` if there
+  is no record at :obj:`record_path` or its settings differ from
+  :obj:`record`.
+  """
+  if not tf.io.gfile.exists(record_path):
+    return None
+  with tf.io.gfile.GFile(record_path) as record_file:
+    previous_record = yaml.load(record_file.read(), Loader=yaml.UnsafeLoader)
+  batch_size = previous_record.pop("batch_size", None)
+  if batch_size is not None and previous_record == record:
+    return batch_size
+  return None
+
+def _save_tuned_batch_size(record_path, record, batch_size):
+  """Saves the tuned batch size and the settings it was tuned with."""
+  record = dict(record)
+  record["batch_size"] = batch_size
+  with tf.io.gfile.GFile(record_path, mode="w") as record_file:
+    yaml.dump(record, record_file, default_flow_style=False)
+
+def _run_batch_size_trial(config,
+                          model_description,
+                          checkpoint_path,
+                          num_devices,
+                          mixed_precision):
+  """Runs a few training iterations to check that the batch size fits in memory.
+
+  This function runs in a separate process spawned by
+  :func:`_auto_tune_batch_size`: a failure, in particular an out-of-memory
+  error, is reported to the parent through the process exit code.
+  """
+  tf.get_logger().setLevel(logging.ERROR)
+  model = config_util.load_model(
+      config["model_dir"], model_file=model_description, serialize_model=False)
+  runner = Runner(model, config, mixed_precision=mixed_precision)
+  runner.train(num_devices=num_devices, checkpoint_path=checkpoint_path)
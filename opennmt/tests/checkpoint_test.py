@@ -24,6 +24,12 @@ class _DummyModel(tf.keras.layers.Layer):
     return x
 
 
+class _NonDeepCopyableModel(_DummyModel):
+
+  def __deepcopy__(self, memo):
+    raise NotImplementedError("This model does not support deepcopy")
+
+
 class CheckpointTest(tf.test.TestCase):
 
   def testLastSavedStep(self):
@@ -41,6 +47,98 @@ class CheckpointTest(tf.test.TestCase):
     checkpoint = checkpoint_util.Checkpoint(model, model_dir=model_dir)
     self.assertEqual(checkpoint.last_saved_step, 20)
 
+  def testBackgroundSave(self):
+    model = _DummyModel()
+    optimizer = tf.keras.optimizers.Adam()
+
+    @tf.function
+    def _build_model():
+      x = tf.random.uniform([4, 10])
+      y = model(x)
+      loss = tf.reduce_mean(y)
+      gradients = optimizer.get_gradients(loss, model.trainable_variables)
+      optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+
+    _build_model()
+    model_dir = os.path.join(self.get_temp_dir(), "model")
+    checkpoint = checkpoint_util.Checkpoint(model, optimizer=optimizer, model_dir=model_dir)
+
+    model.layers[0].kernel.assign(tf.ones_like(model.layers[0].kernel))
+    self.assertIsNone(checkpoint.save(10, background=True))
+    # The snapshot is taken before save() returns, so later updates should not
+    # appear in the checkpoint.
+    model.layers[0].kernel.assign(2 * tf.ones_like(model.layers[0].kernel))
+    checkpoint.wait_for_pending_save()
+    self.assertEqual(checkpoint.last_saved_step, 10)
+
+    restored_model = _DummyModel()
+    restored_model(tf.random.uniform([4, 10]))
+    restored_checkpoint = checkpoint_util.Checkpoint(restored_model, model_dir=model_dir)
+    path = restored_checkpoint.restore(weights_only=True)
+    self.assertIsNotNone(path)
+    self.assertAllEqual(
+        restored_model.layers[0].kernel, tf.ones_like(restored_model.layers[0].kernel))
+
+  def testBackgroundSaveOptimizerSlots(self):
+
+    def _create_and_build():
+      model = _DummyModel()
+      optimizer = tf.keras.optimizers.Adam()
+
+      @tf.function
+      def _build_model():
+        x = tf.random.uniform([4, 10])
+        y = model(x)
+        loss = tf.reduce_mean(y)
+        gradients = optimizer.get_gradients(loss, model.trainable_variables)
+        optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+
+      _build_model()
+      return model, optimizer
+
+    model, optimizer = _create_and_build()
+    model_dir = os.path.join(self.get_temp_dir(), "model")
+    checkpoint = checkpoint_util.Checkpoint(model, optimizer=optimizer, model_dir=model_dir)
+    slot = optimizer.get_slot(model.layers[0].kernel, "m")
+    slot.assign(tf.ones_like(slot))
+    self.assertIsNone(checkpoint.save(10, background=True))
+    checkpoint.wait_for_pending_save()
+
+    restored_model, restored_optimizer = _create_and_build()
+    restored_checkpoint = checkpoint_util.Checkpoint(
+        restored_model, optimizer=restored_optimizer, model_dir=model_dir)
+    self.assertIsNotNone(restored_checkpoint.restore())
+    restored_slot = restored_optimizer.get_slot(restored_model.layers[0].kernel, "m")
+    self.assertAllEqual(restored_slot, tf.ones_like(restored_slot))
+
+  def testBackgroundAndSyncSaves(self):
+    model = _DummyModel()
+    model(tf.random.uniform([4, 10]))
+    model_dir = os.path.join(self.get_temp_dir(), "model")
+    checkpoint = checkpoint_util.Checkpoint(model, model_dir=model_dir, keep_checkpoint_max=2)
+    self.assertIsNone(checkpoint.save(10, background=True))
+    self.assertIsNotNone(checkpoint.save(20))
+    self.assertIsNone(checkpoint.save(30, background=True))
+    checkpoint.wait_for_pending_save()
+    self.assertEqual(checkpoint.last_saved_step, 30)
+    checkpoint_state = tf.train.get_checkpoint_state(model_dir)
+    steps = [
+        checkpoint_util.get_step_from_checkpoint_prefix(path)
+        for path in checkpoint_state.all_model_checkpoint_paths]
+    self.assertListEqual(steps, [20, 30])
+
+  def testBackgroundSaveFallback(self):
+    model = _NonDeepCopyableModel()
+    model(tf.random.uniform([4, 10]))
+    model_dir = os.path.join(self.get_temp_dir(), "model")
+    checkpoint = checkpoint_util.Checkpoint(model, model_dir=model_dir)
+    # When the variables cannot be copied, the save should fall back to a
+    # synchronous write.
+    path = checkpoint.save(10, background=True)
+    self.assertIsNotNone(path)
+    self.assertEqual(checkpoint.last_saved_step, 10)
+    self.assertIsNotNone(tf.train.latest_checkpoint(model_dir))
+
   def testCheckpointAveraging(self):
     model = _DummyModel()
     optimizer = tf.keras.optimizers.Adam()
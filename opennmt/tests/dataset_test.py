@@ -42,6 +42,35 @@ class DatasetTest(tf.test.TestCase):
     for count, freq in zip(counts, target_distribution):
       self.assertNear(count / total_count, freq, 0.05)
 
+  def testTrainingPipelineWithCacheFile(self):
+    cache_path = os.path.join(self.get_temp_dir(), "cache")
+    dataset = tf.data.Dataset.range(10)
+    dataset = dataset.apply(dataset_util.training_pipeline(
+        batch_size=2,
+        shuffle_buffer_size=-1,
+        cache_path=cache_path))
+    # Read more than one epoch so the cache is written and then read from.
+    batches = list(dataset.take(10))
+    self.assertLen(batches, 10)
+    cache_files = [
+        name for name in os.listdir(self.get_temp_dir()) if name.startswith("cache")]
+    self.assertNotEmpty(cache_files)
+
+  def testTrainingPipelineCacheDisabledOnSmallShuffleBuffer(self):
+    # A shuffle buffer smaller than the dataset shards it with partial
+    # iterations, which is incompatible with caching.
+    cache_path = os.path.join(self.get_temp_dir(), "cache")
+    dataset = tf.data.Dataset.range(10)
+    dataset = dataset.apply(dataset_util.training_pipeline(
+        batch_size=2,
+        shuffle_buffer_size=3,
+        cache_path=cache_path))
+    batches = list(dataset.take(10))
+    self.assertLen(batches, 10)
+    cache_files = [
+        name for name in os.listdir(self.get_temp_dir()) if name.startswith("cache")]
+    self.assertEmpty(cache_files)
+
   def testDatasetSize(self):
     path = test_util.make_data_file(
         os.path.join(self.get_temp_dir(), "file.txt"),
@@ -191,6 +220,24 @@ class DatasetTest(tf.test.TestCase):
         self.assertGreaterEqual(256, batch_size * max_length)
     self._testBatchTrainDataset(_check_fn, 256, batch_type="tokens", length_bucket_width=1)
 
+  def testBatchTrainDatasetTokensMultiple(self):
+    # The number of examples per batch is rounded down to the multiple, so the
+    # token budget must hold unless the batch is at the minimum size enforced
+    # by the multiple.
+    def _check_fn(iterator):
+      for _ in range(20):
+        features, labels = next(iterator)
+        batch_size = features.shape[0]
+        max_length = max(list(features) + list(labels))
+        if batch_size > 8:
+          self.assertGreaterEqual(256, batch_size * max_length)
+    self._testBatchTrainDataset(
+        _check_fn,
+        256,
+        batch_type="tokens",
+        batch_size_multiple=8,
+        length_bucket_width=1)
+
   def testReorderInferDataset(self):
     dataset = tf.data.Dataset.from_tensor_slices([8, 2, 5, 6, 7, 1, 3, 9])
     dataset = dataset.map(lambda x: {"length": x})
@@ -11,6 +11,7 @@ import tensorflow as tf
 
 from opennmt import decoders
 from opennmt import models
+from opennmt import runner as runner_util
 from opennmt import Runner
 from opennmt.config import load_model
 from opennmt.utils import exporters
@@ -306,6 +307,25 @@ class RunnerTest(tf.test.TestCase):
       lines = f.readlines()
     self.assertEqual(len(lines), 5)
 
+  def testTunedBatchSizeRecord(self):
+    record_path = os.path.join(self.get_temp_dir(), "autotuned_batch_size.yml")
+    record = {
+        "batch_type": "tokens",
+        "max_batch_size": 16384,
+        "maximum_features_length": 100,
+        "maximum_labels_length": 100,
+        "mixed_precision": False,
+        "num_devices": 1,
+    }
+    self.assertIsNone(runner_util._load_tuned_batch_size(record_path, record))
+    runner_util._save_tuned_batch_size(record_path, record, 4096)
+    self.assertEqual(runner_util._load_tuned_batch_size(record_path, dict(record)), 4096)
+    # The tuned batch size should not be reused when a setting that constrains
+    # the memory usage changed.
+    changed_record = dict(record)
+    changed_record["maximum_features_length"] = 150
+    self.assertIsNone(runner_util._load_tuned_batch_size(record_path, changed_record))
+
   @parameterized.expand([[True], [False]])
   def testExport(self, export_vocabulary_assets):
     config = {
@@ -93,11 +93,16 @@ class Trainer:
       tf.summary.experimental.set_step(iterations)
 
       step = None
+      synchronized = False
       moving_average = None
+      # Each training step usually returns one parameter update so we can count
+      # steps locally and only synchronize with the device on reporting
+      # boundaries. Reading a tensor value (e.g. with .numpy()) blocks the
+      # training on a device to host transfer so we avoid doing that on each
+      # step.
+      start_step = iterations.numpy()
+      last_step = start_step
       for loss in self._steps(dataset, accum_steps=accum_steps, report_steps=report_steps):
-        if tf.math.is_nan(loss):
-          raise RuntimeError("Model diverged with loss = NaN.")
-
         if moving_average_decay is not None and self._is_master:
           if moving_average is None:
             moving_average = MovingAverage(
@@ -107,18 +112,37 @@ class Trainer:
           else:
             moving_average.update()
 
-        step = iterations.numpy()
-        self._training_stats.update_on_step(step, loss.numpy())
-        if step % report_steps == 0:
+        last_step += 1
+        step = last_step
+        synchronized = False
+        report_step = step % report_steps == 0
+        save_step = step == 1 or (save_steps is not None and step % save_steps == 0)
+        eval_step = eval_steps is not None and step % eval_steps == 0
+        # The first steps are also synchronized so that the statistics warmup,
+        # which discards the tracing time from the throughput values, completes
+        # before the first report.
+        warmup_step = step - start_step <= self._training_stats.warmup_steps
+        if warmup_step or report_step or save_step or eval_step or step == max_step:
+          if tf.math.is_nan(loss):
+            raise RuntimeError("Model diverged with loss = NaN.")
+          # The optimizer can skip the parameter update and leave its step
+          # counter unchanged, e.g. when the dynamic loss scale detects an
+          # overflow, so resynchronize the local counter while a host transfer
+          # is required anyway.
+          last_step = iterations.numpy()
+          step = last_step
+          self._training_stats.update_on_step(step, loss.numpy())
+          synchronized = True
+        if report_step:
           self._training_stats.log(self._is_master)
-        if step == 1 or (save_steps is not None and step % save_steps == 0):
-          self._save_checkpoint(step, moving_average=moving_average)
-        if eval_steps is not None and step % eval_steps == 0:
+        if save_step:
+          self._save_checkpoint(step, moving_average=moving_average, background=True)
+        if eval_step:
           early_stop = self._evaluate(evaluator, step, moving_average=moving_average)
           if early_stop:
             tf.get_logger().warning("Early stopping conditions are met. Exiting.")
             break
-        if step == max_step:
+        if max_step is not None and step >= max_step:
           break
 
       if step is None:
@@ -126,17 +150,28 @@ class Trainer:
                            "training file is empty or all examples were filtered out. "
                            "For the latter, verify that the maximum_*_length values are "
                            "consistent with your data.")
+      if not synchronized:
+        # The dataset ended between two synchronization boundaries: record the
+        # actual final step and loss so that the global summary and the final
+        # checkpoint are consistent.
+        if tf.math.is_nan(loss):
+          raise RuntimeError("Model diverged with loss = NaN.")
+        last_step = iterations.numpy()
+        step = last_step
+        self._training_stats.update_on_step(step, loss.numpy())
       summary = self._training_stats.get_global_summary()
       self._save_checkpoint(step, moving_average=moving_average)
       self._evaluate(evaluator, step, moving_average=moving_average)
+      if self._checkpoint is not None:
+        self._checkpoint.wait_for_pending_save()
       return summary
 
-  def _save_checkpoint(self, step, moving_average=None):
+  def _save_checkpoint(self, step, moving_average=None, background=False):
     """Saves a checkpoint for step."""
     if not self._is_master or self._checkpoint is None or step == self._checkpoint.last_saved_step:
       return
     with moving_average.shadow_variables() if moving_average is not None else contextlib.suppress():
-      self._checkpoint.save(step)
+      self._checkpoint.save(step, background=background)
 
   def _evaluate(self, evaluator, step, moving_average=None):
     """Runs evaluation for step. Returns ``True`` is early conditions are met."""
@@ -199,25 +234,29 @@ class Trainer:
 
     else:
 
+      # A single graph accumulates the gradients and possibly applies them, so
+      # that each iteration runs one function call instead of two. As
+      # apply_gradients is a Python boolean, the function is traced (and
+      # cached) once for each value.
       @tf.function
-      def _forward():
+      def _forward_and_maybe_step(apply_gradients):
         source, target = next(iterator)
-        return self._forward(
+        loss = self._forward(
             source,
             target,
             record_summaries=self._should_record_summaries(report_steps, with_accum=True))
-
-      @tf.function
-      def _step():
-        return self._step()
+        if apply_gradients:
+          self._step()
+          loss = self._reduce_loss(loss)
+        return loss
 
       for i in itertools.count():
+        apply_gradients = i == 0 or (i + 1) % accum_steps == 0
         try:
-          loss = _forward()
+          loss = _forward_and_maybe_step(apply_gradients)
         except tf.errors.OutOfRangeError:  # Dataset iterator exhausted.
           break
-        if i == 0 or (i + 1) % accum_steps == 0:
-          _step()
+        if apply_gradients:
           if i == 0:
             self._broadcast_variables()
           yield loss
@@ -313,6 +352,10 @@ class Trainer:
         scale=self._gradient_accumulator.step)
     self._gradient_accumulator.reset()
 
+  def _reduce_loss(self, loss):
+    """Reduces the loss returned by :meth:`Trainer._forward` to a single value."""
+    return loss
+
   def _broadcast_variables(self):
     """Broadcasts variables to other replicas, if required."""
     return
@@ -393,15 +436,20 @@ class MirroredStrategyTrainer(Trainer):
         super()._forward_and_step,
         args=(source, target),
         kwargs=dict(record_summaries=record_summaries))
-    return self._strategy.reduce(tf.distribute.ReduceOp.MEAN, per_replica_loss, None)
+    return self._reduce_loss(per_replica_loss)
 
   def _forward(self, source, target, record_summaries=False):
-    per_replica_loss = self._strategy.run(
+    # The per replica loss is returned unreduced: losses of intermediate
+    # accumulation steps are not reported so reducing them would run a
+    # cross-replica communication for a value that is discarded. The caller
+    # reduces the loss with _reduce_loss on the apply step only.
+    return self._strategy.run(
         super()._forward,
         args=(source, target),
         kwargs=dict(record_summaries=record_summaries))
-    # TODO: this reduction could be delayed until _step is called.
-    return self._strategy.reduce(tf.distribute.ReduceOp.MEAN, per_replica_loss, None)
+
+  def _reduce_loss(self, loss):
+    return self._strategy.reduce(tf.distribute.ReduceOp.MEAN, loss, None)
 
   def _step(self):
     self._strategy.run(super()._step)
@@ -491,9 +539,15 @@ class TrainingStats:
     self._average_loss = 0
     self._last_loss = None
     self._last_step = optimizer.iterations.numpy()
+    self._first_step = self._last_step
     self._last_logged_step = self._last_step
     self._last_logged_time = time.time()
 
+  @property
+  def warmup_steps(self):
+    """The number of updates for which throughput values are ignored."""
+    return self._warmup_steps
+
   def update_on_example(self, source, target):
     """Updates the training statistics on a new training example.
 
@@ -543,14 +597,17 @@ class TrainingStats:
     """Returns a summary of the training since the beginning.
 
     Returns:
-      A dictionary containing various statistics.
+      A dictionary containing various statistics. The average loss is computed
+      over the loss values sampled when :meth:`update_on_step` is called.
     """
     return {
         "average_loss": self._average_loss,
         "last_learning_rate": self._get_learning_rate(),
         "last_loss": self._last_loss,
         "last_step": self._last_step,
-        "num_steps": self._num_updates,
+        # The number of steps is derived from the exact step counter as the
+        # statistics are not necessarily updated on each step.
+        "num_steps": self._last_step - self._first_step,
     }
 
   def log(self, is_master=True):
@@ -604,13 +661,21 @@ class TrainingStats:
     return learning_rate
 
   def _update_words_counter(self, name, features):
-    """Accumulates the number of source and target tokens to report throughput."""
+    """Accumulates the number of source and target tokens to report throughput.
+
+    The counters are updated in the graph and only read on report boundaries
+    (see :meth:`get_last_summary`) to avoid a device to host synchronization
+    on each training step.
+    """
     length = features.get("length")
     if length is None:
       return
     num_words = tf.reduce_sum(length)
     counter = self._words_counters.get(name)
     if counter is None:
+      # The counter variable is created lazily, within the replica context when
+      # running under a distribution strategy, so that each replica accumulates
+      # locally and the values are summed on read.
       counter = tf.Variable(
           tf.constant(0, dtype=tf.int64),
           trainable=False,
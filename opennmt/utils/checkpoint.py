@@ -1,5 +1,6 @@
 """Checkpoint utilities."""
 
+import concurrent.futures
 import copy
 import os
 import tempfile
@@ -31,9 +32,14 @@ class Checkpoint(object):
     self._model = model
     self._optimizer = optimizer
     self._model_dir = model_dir
+    self._keep_checkpoint_max = keep_checkpoint_max
     self._checkpoint = tf.train.Checkpoint(**trackables)
     self._checkpoint_manager = tf.train.CheckpointManager(
         self._checkpoint, model_dir, keep_checkpoint_max)
+    self._checkpoint_copy = None
+    self._executor = None
+    self._pending_save = None
+    self._last_saved_step = None
 
   @classmethod
   def from_config(cls, config, model, optimizer=None):
@@ -74,23 +80,103 @@ class Checkpoint(object):
   @property
   def last_saved_step(self):
     """The last training step that was saved."""
+    if self._last_saved_step is not None:
+      return self._last_saved_step
     latest_checkpoint = self._checkpoint_manager.latest_checkpoint
     if latest_checkpoint is None:
       return None
     return get_step_from_checkpoint_prefix(latest_checkpoint)
 
-  def save(self, step=None):
+  def save(self, step=None, background=False):
     """Saves a checkpoint.
 
     Args:
       step: The step to save for. If ``None``, get the value from ``optimizer.iterations``.
+      background: If ``True``, write the checkpoint in a background thread so
+        that the caller does not wait on the serialization and filesystem I/O.
+        The variable values are first copied on the CPU to get a consistent
+        snapshot.
 
     Returns:
-      The path to the saved checkpoint.
+      The path to the saved checkpoint, or ``None`` when the checkpoint is
+      written in the background. Use :meth:`wait_for_pending_save` to wait for
+      a background write to complete.
     """
     if step is None:
       step = self._optimizer.iterations
+    step = int(step)
+    self.wait_for_pending_save()
+    if background and self._checkpoint_copy is None:
+      self._checkpoint_copy = self._create_checkpoint_copy()
+    if self._checkpoint_copy is not None:
+      # Once the copy exists, all saves go through its checkpoint manager so
+      # that a single manager tracks the checkpoints to keep on disk.
+      self._update_checkpoint_copy()
+      self._last_saved_step = step
+      future = self._executor.submit(self._save_checkpoint_copy, step)
+      if background:
+        self._pending_save = future
+        return None
+      return future.result()
     path = self._checkpoint_manager.save(checkpoint_number=step)
+    self._last_saved_step = step
+    tf.get_logger().info("Saved checkpoint %s", path)
+    return path
+
+  def wait_for_pending_save(self):
+    """Waits for a background checkpoint save to complete, if any."""
+    if self._pending_save is not None:
+      future = self._pending_save
+      self._pending_save = None
+      future.result()
+
+  def _create_checkpoint_copy(self):
+    # The background save serializes a copy of the model and optimizer
+    # variables placed on the CPU: the training thread refreshes the copied
+    # values on each save while the background thread writes them to disk.
+    try:
+      with tf.device("/cpu:0"):
+        model = misc.clone_layer(self._model)
+        optimizer = copy.deepcopy(self._optimizer) if self._optimizer is not None else None
+    except Exception as e:  # pylint: disable=broad-except
+      tf.get_logger().warning(
+          "Cannot copy the model variables to save checkpoints in the "
+          "background (%s). Falling back to synchronous checkpoint saves.", e)
+      return None
+    trackables = {}
+    trackables["model"] = model
+    if optimizer is not None:
+      _remap_optimizer_slots(
+          optimizer, self._model.trainable_variables, model.trainable_variables)
+      trackables["optimizer"] = optimizer
+    checkpoint = tf.train.Checkpoint(**trackables)
+    checkpoint_manager = tf.train.CheckpointManager(
+        checkpoint, self._model_dir, self._keep_checkpoint_max)
+    if self._executor is None:
+      self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return (model, optimizer, checkpoint_manager)
+
+  def _update_checkpoint_copy(self):
+    model, optimizer, _ = self._checkpoint_copy
+    if len(model.variables) != len(self._model.variables):
+      raise ValueError(
+          "Cannot snapshot the variables for a background checkpoint save: "
+          "the model copy has %d variables but the model has %d"
+          % (len(model.variables), len(self._model.variables)))
+    for copied, variable in zip(model.variables, self._model.variables):
+      copied.assign(variable)
+    if optimizer is not None:
+      if len(optimizer.weights) != len(self._optimizer.weights):
+        raise ValueError(
+            "Cannot snapshot the variables for a background checkpoint save: "
+            "the optimizer copy has %d weights but the optimizer has %d"
+            % (len(optimizer.weights), len(self._optimizer.weights)))
+      for copied, variable in zip(optimizer.weights, self._optimizer.weights):
+        copied.assign(variable)
+
+  def _save_checkpoint_copy(self, step):
+    _, _, checkpoint_manager = self._checkpoint_copy
+    path = checkpoint_manager.save(checkpoint_number=step)
     tf.get_logger().info("Saved checkpoint %s", path)
     return path
 
@@ -139,6 +225,39 @@ class Checkpoint(object):
     return checkpoint_path
 
 
+def _var_key(variable):
+  """Returns the key used by Keras optimizers to map a variable to its slots.
+
+  This replicates the private Keras helper of the same name.
+  """
+  # pylint: disable=protected-access
+  if hasattr(variable, "_distributed_container"):
+    variable = variable._distributed_container()
+  if variable._in_graph_mode:
+    return variable._shared_name
+  return variable._unique_id
+
+def _remap_optimizer_slots(optimizer, variables, copied_variables):
+  """Remaps the slots of a deep copied optimizer to the copied variables.
+
+  Keras optimizers key their slots by variable, so after a deep copy the
+  copied slot variables are still keyed by the original variables:
+  ``optimizer.get_slot`` does not resolve for the copied variables and the
+  slots would be silently missing from the saved checkpoints.
+
+  Args:
+    optimizer: The deep copied optimizer.
+    variables: The original variables.
+    copied_variables: The copied variables, in the same order.
+  """
+  # pylint: disable=protected-access
+  slots = {}
+  for variable, copied_variable in zip(variables, copied_variables):
+    slot_dict = optimizer._slots.get(_var_key(variable))
+    if slot_dict is not None:
+      slots[_var_key(copied_variable)] = slot_dict
+  optimizer._slots = slots
+
 def get_step_from_checkpoint_prefix(prefix):
   """Extracts the training step from the checkpoint file prefix."""
   return int(prefix.split("-")[-1])
@@ -77,19 +77,22 @@ def get_primary_variable(variable):
     return variable._primary  # pylint: disable=protected-access
   return variable
 
-def print_as_bytes(text, stream=None):
+def print_as_bytes(text, stream=None, flush=False):
   """Prints a string as bytes to non rely on :obj:`stream` default encoding.
 
   Args:
     text: The text to print.
     stream: The stream to print to (``sys.stdout`` if not set).
+    flush: If ``True``, flush the stream after writing. Callers writing many
+      lines should flush once per batch instead to amortize the I/O cost.
   """
   if stream is None:
     stream = sys.stdout
   write_buffer = stream.buffer if hasattr(stream, "buffer") else stream
   write_buffer.write(tf.compat.as_bytes(text))
   write_buffer.write(b"\n")
-  stream.flush()
+  if flush:
+    stream.flush()
 
 def format_translation_output(sentence,
                               score=None,